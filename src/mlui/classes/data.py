@@ -31,11 +31,12 @@ class Data:
 
     def update_state(self) -> None:
         """
-        Update the internal state of the DataFrame, resetting its columns and unused
-        columns.
+        Update the internal state of the DataFrame, resetting its columns, unused
+        columns, and statistics.
         """
         self._columns: t.Columns = list(self._dataframe.columns)
         self._unused_columns: t.Columns = self._columns.copy()
+        self._stats: t.DataFrame | None = None
 
     def upload(self, buff: io.BytesIO) -> None:
         """
@@ -53,7 +54,7 @@ class Data:
             to the DataFrame. If there is an issue validating the DataFrame.
         """
         try:
-            csv_str = buff.getvalue().decode("utf-8")
+            csv_str = tools.data.read_sample(buff)
             delimiter = tools.data.parse_csv(csv_str)
         except errors.ParseCSVError as error:
             raise errors.UploadError(error)
@@ -107,6 +108,8 @@ class Data:
         """
         Get descriptive statistics and data types information for the DataFrame.
 
+        The statistics are computed once per uploaded DataFrame and reused afterward.
+
         Returns
         -------
         DataFrame
@@ -117,6 +120,9 @@ class Data:
         PlotError
             If there is an issue generating the statistics.
         """
+        if self._stats is not None:
+            return self._stats.copy()
+
         try:
             stats = pd.concat(
                 [
@@ -132,7 +138,9 @@ class Data:
         except ValueError:
             stats = pd.DataFrame()
 
-        return stats
+        self._stats = stats
+
+        return stats.copy()
 
     def plot_columns(self, x: str | None, y: str | None, points: bool) -> t.Chart:
         """
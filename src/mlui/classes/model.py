@@ -1,8 +1,11 @@
+import hashlib
 import io
+import math
 import tempfile
 import typing
 
 import altair as alt
+import numpy as np
 import pandas as pd
 import tensorflow as tf
 
@@ -20,8 +23,37 @@ class Model:
     learning model.
     """
 
+    __slots__ = (
+        "_strategy",
+        "_object",
+        "_built",
+        "_graph",
+        "_quantized",
+        "_name",
+        "_inputs",
+        "_outputs",
+        "_input_shape",
+        "_output_shape",
+        "_optimizer",
+        "_losses",
+        "_metrics",
+        "_callbacks",
+        "_compiled",
+        "_history",
+        "_input_features",
+        "_output_features",
+        "_input_configured",
+        "_output_configured",
+    )
+
     def __init__(self) -> None:
-        """Initialize an empty model."""
+        """
+        Initialize an empty model.
+
+        The model's variables are mirrored across all available devices, so the
+        training is distributed among them.
+        """
+        self._strategy: t.Strategy = tf.distribute.MirroredStrategy()
         self.reset_state()
 
     def reset_state(self) -> None:
@@ -33,19 +65,39 @@ class Model:
         """
         self._object: t.Object = tf.keras.Model(inputs=list(), outputs=list())
         self._built: bool = False
+        self._graph: tuple[str, bytes] | None = None
+        self._losses: t.LayerLosses = dict()
+        self._metrics: t.LayerMetrics = dict()
         self._set_config()
         self.update_state()
 
     def _set_config(self) -> None:
-        """Set the configuration attributes for the model."""
+        """
+        Set the configuration attributes for the model.
+
+        The loss functions and metrics chosen so far are kept for the output layers
+        that remain in the model, so recreating the model doesn't discard them.
+        """
         self._name: str = self._object.name
         self._inputs: t.Layers = typing.cast(t.Layers, self._object.input_names)
         self._outputs: t.Layers = typing.cast(t.Layers, self._object.output_names)
-        self._input_shape: t.LayerShape = self._get_processed_shape("input")
-        self._output_shape: t.LayerShape = self._get_processed_shape("output")
+        self._input_shape: t.LayerShape = {
+            layer: tensor.shape[1]
+            for layer, tensor in zip(self._inputs, self._object.inputs)
+        }
+        self._output_shape: t.LayerShape = {
+            layer: tensor.shape[1]
+            for layer, tensor in zip(self._outputs, self._object.outputs)
+        }
         self._optimizer: t.Optimizer = None
-        self._losses: t.LayerLosses = dict.fromkeys(self._outputs)
-        self._metrics: t.LayerMetrics = dict.fromkeys(self._outputs, list())
+        self._quantized: dict[t.Quantization, bytes] = dict()
+
+        if list(self._losses) != self._outputs:
+            self._losses = {layer: self._losses.get(layer) for layer in self._outputs}
+            self._metrics = {
+                layer: self._metrics.get(layer, list()) for layer in self._outputs
+            }
+
         self._callbacks: t.Callbacks = dict()
         self._compiled: bool = self._object._is_compiled
         self._history: t.DataFrame = pd.DataFrame()
@@ -59,74 +111,65 @@ class Model:
         self._input_configured: t.LayerConfigured = dict.fromkeys(self._inputs, False)
         self._output_configured: t.LayerConfigured = dict.fromkeys(self._outputs, False)
 
-    def _shapes_to_list(self, shapes: t.Shapes) -> list[t.Shape]:
-        """
-        Convert shapes from a dictionary or a single tuple to a list.
-
-        Parameters
-        ----------
-        shapes : dict of tuples, list of tuples or tuple
-            Input or output shapes. Single shape is a `tuple` of `(None, int)`.
-
-        Returns
-        -------
-        list of tuples
-            Converted shapes.
+    def _get_processed_data(self, data: t.DataFrame, at: t.Side) -> t.LayerData:
         """
-        if isinstance(shapes, dict):
-            return list(shapes.values())
+        Process the input or output data based on the specified side.
 
-        return [shapes] if isinstance(shapes, tuple) else shapes
-
-    def _get_processed_shape(self, at: t.Side) -> t.LayerShape:
-        """
-        Retrieve and process the shapes of input or output layers.
+        The columns of all layers are extracted from the DataFrame at once and cast to
+        float32, which the model computes in, and each layer gets a view of its own
+        columns.
 
         Parameters
         ----------
+        data : DataFrame
+            Input or output data.
         at : {'input', 'output'}
-            Side to retrieve shapes for.
+            Side to process data for.
 
         Returns
         -------
-        dict of {str to int}
-            Processed shapes for the specified side.
+        dict of {str to NDArray}
+            Processed data.
         """
         if at == "input":
             layers = self._inputs
-            shapes = self._object.input_shape
+            features = self._input_features
         else:
             layers = self._outputs
-            shapes = self._object.output_shape
+            features = self._output_features
 
-        shapes = self._shapes_to_list(shapes)
+        columns = [column for layer in layers for column in features[layer]]
+        array = data[columns].to_numpy(dtype=np.float32)
+        processed: t.LayerData = dict()
+        start = 0
 
-        return {layer: shape[1] for layer, shape in zip(layers, shapes)}
+        for layer in layers:
+            stop = start + len(features[layer])
+            processed[layer] = array[:, start:stop]
+            start = stop
 
-    def _get_processed_data(self, data: t.DataFrame, at: t.Side) -> t.LayerData:
+        return processed
+
+    def _get_batched_dataset(self, dataset: t.Dataset, batch_size: int) -> t.Dataset:
         """
-        Process the input or output data based on the specified side.
+        Batch the dataset and prefetch its batches.
+
+        Prefetching lets the next batches be prepared while the model processes the
+        current one.
 
         Parameters
         ----------
-        data : DataFrame
-            Input or output data.
-        at : {'input', 'output'}
-            Side to process data for.
+        dataset : Dataset
+            Dataset to be batched.
+        batch_size : int
+            Batch size.
 
         Returns
         -------
-        dict of {str to NDArray}
-            Processed data.
+        Dataset
+            Batched and prefetched dataset.
         """
-        if at == "input":
-            layers = self._inputs
-            features = self._input_features
-        else:
-            layers = self._outputs
-            features = self._output_features
-
-        return {layer: data[features[layer]].to_numpy() for layer in layers}
+        return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
 
     def set_optimizer(self, entity: str, params: t.OptimizerParams) -> None:
         """
@@ -146,7 +189,9 @@ class Model:
         """
         try:
             prototype = enums.optimizers.classes[entity]
-            self._optimizer = prototype(**params)
+
+            with self._strategy.scope():
+                self._optimizer = prototype(**params)
         except KeyError:
             raise errors.SetError("There is no prototype for this optimizer!")
         except (ValueError, AttributeError, TypeError):
@@ -221,10 +266,16 @@ class Model:
         """
         return self._metrics[layer].copy() if self._metrics.get(layer) else list()
 
-    def compile(self) -> None:
+    def compile(self, jit_compile: bool = True) -> None:
         """
         Compile the model.
 
+        Parameters
+        ----------
+        jit_compile : bool, default True
+            Whether to compile the model with XLA, fusing its operations into fewer
+            kernels during training, evaluation, and making predictions.
+
         Raises
         ------
         ModelError
@@ -239,9 +290,13 @@ class Model:
             )
 
         try:
-            self._object.compile(
-                optimizer=self._optimizer, loss=self._losses, metrics=self._metrics
-            )
+            with self._strategy.scope():
+                self._object.compile(
+                    optimizer=self._optimizer,
+                    loss=self._losses,
+                    metrics=self._metrics,
+                    jit_compile=jit_compile,
+                )
         except (ValueError, AttributeError, TypeError):
             raise errors.ModelError("Unable to compile the model!")
 
@@ -313,6 +368,30 @@ class Model:
 
         return features[layer].copy() if features.get(layer) else list()
 
+    def get_shape(self, layer: str, at: t.Side) -> int | None:
+        """
+        Get the shape of a specific input or output layer, which is the number of
+        features it takes.
+
+        Parameters
+        ----------
+        layer : str
+            Name of the layer.
+        at : {'input', 'output'}
+            Side to get the shape for.
+
+        Returns
+        -------
+        int or None
+            Shape of the layer, or None if there is no such layer.
+        """
+        if at == "input":
+            shapes = self._input_shape
+        else:
+            shapes = self._output_shape
+
+        return shapes.get(layer)
+
     def set_callback(self, entity: str, params: t.CallbackParams) -> None:
         """
         Set the callback for the model.
@@ -375,7 +454,7 @@ class Model:
         data : DataFrame
             Input and output data.
         batch_size : int
-            Batch size.
+            Batch size per device.
         num_epochs : int
             Number of epochs.
         val_split : float
@@ -389,16 +468,33 @@ class Model:
         if tools.data.contains_nonnumeric_dtypes(data):
             raise errors.ModelError("The data for fitting contains non-numeric values!")
 
+        split_at = math.ceil(len(data) * (1 - val_split))
+        # The global batch is split among the replicas, so scale it per replica
+        global_batch_size = batch_size * self._strategy.num_replicas_in_sync
+
+        if not 0 < split_at < len(data):
+            raise errors.ModelError("Please, adjust the validation split!")
+
+        # The weights are about to change, so the quantized models are outdated
+        self._quantized = dict()
+
         try:
+            dataset = tf.data.Dataset.from_tensor_slices(
+                (
+                    self._get_processed_data(data, "input"),
+                    self._get_processed_data(data, "output"),
+                )
+            )
+            # Keep the last samples for validation, as 'validation_split' does
+            train_data = dataset.take(split_at).cache().shuffle(split_at)
+            val_data = dataset.skip(split_at).cache()
             logs = self._object.fit(
-                x=self._get_processed_data(data, "input"),
-                y=self._get_processed_data(data, "output"),
-                batch_size=batch_size,
+                x=self._get_batched_dataset(train_data, global_batch_size),
+                validation_data=self._get_batched_dataset(val_data, global_batch_size),
                 epochs=num_epochs,
-                validation_split=val_split,
                 callbacks=self._callbacks.values(),
             )
-        except (RuntimeError, ValueError, AttributeError, TypeError):
+        except (RuntimeError, ValueError, AttributeError, TypeError, tf.errors.OpError):
             raise errors.ModelError("Unable to fit the model!")
 
         self._update_history(pd.DataFrame(logs.history))
@@ -459,6 +555,47 @@ class Model:
 
         return chart
 
+    def get_quantized_bytes(self, quantization: t.Quantization) -> bytes:
+        """
+        Get the bytes representation of the model quantized for inference.
+
+        The model is converted to the TensorFlow Lite format with its weights stored
+        either as float16 or as int8 with dynamic range quantization. The conversion
+        result is kept until the model is changed or fitted again.
+
+        Parameters
+        ----------
+        quantization : {'float16', 'int8'}
+            Type of the quantized weights.
+
+        Returns
+        -------
+        bytes
+            Bytes representation of the quantized model.
+
+        Raises
+        ------
+        ModelError
+            If there is an issue converting the model.
+        """
+        if quantization in self._quantized:
+            return self._quantized[quantization]
+
+        converter = tf.lite.TFLiteConverter.from_keras_model(self._object)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+        if quantization == "float16":
+            converter.target_spec.supported_types = [tf.float16]
+
+        try:
+            model_as_bytes = typing.cast(bytes, converter.convert())
+        except Exception:  # The converter raises its own non-public errors
+            raise errors.ModelError("Unable to quantize the model!")
+
+        self._quantized[quantization] = model_as_bytes
+
+        return model_as_bytes
+
     @property
     def name(self) -> str:
         """Name of the model."""
@@ -534,7 +671,16 @@ class Model:
 
     @property
     def graph(self) -> bytes:
-        """Bytes representation of the model graph."""
+        """
+        Bytes representation of the model graph.
+
+        The graph is rendered once per model's configuration and reused afterward.
+        """
+        config_hash = tools.model.get_config_hash(self._object)
+
+        if self._graph and self._graph[0] == config_hash:
+            return self._graph[1]
+
         with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
             tf.keras.utils.plot_model(
                 self._object, to_file=tmp.name, show_shapes=True, rankdir="LR", dpi=200
@@ -542,6 +688,8 @@ class Model:
 
             graph = tmp.read()
 
+        self._graph = (config_hash, graph)
+
         return graph
 
     @property
@@ -554,18 +702,72 @@ class Model:
 
         return model_as_bytes
 
+    @property
+    def weights_as_bytes(self) -> bytes:
+        """
+        Bytes representation of the saved model's weights.
+
+        Unlike the full model, neither the architecture nor the optimizer's state is
+        serialized.
+        """
+        with tempfile.NamedTemporaryFile(suffix=".h5") as tmp:
+            self._object.save_weights(filepath=tmp.name, save_format="h5")
+
+            weights_as_bytes = tmp.read()
+
+        return weights_as_bytes
+
 
 class UploadedModel(Model):
     """Class representing the uploaded model."""
 
+    __slots__ = ("_predict_function", "_digest")
+
     def __init__(self) -> None:
         """Initialize an empty uploaded machine learning model."""
         super().__init__()
 
+    def reset_state(self) -> None:
+        """Reset the state of the uploaded model."""
+        super().reset_state()
+
+        self._digest: str | None = None
+
+    def _set_config(self) -> None:
+        """
+        Set the configuration attributes for the uploaded model, discarding the
+        function for making predictions.
+        """
+        super()._set_config()
+
+        self._predict_function: tuple[bool, t.PredictFunction] | None = None
+
+    def compile(self, jit_compile: bool = True) -> None:
+        """
+        Compile the uploaded model, discarding the function for making predictions.
+
+        Parameters
+        ----------
+        jit_compile : bool, default True
+            Whether to compile the model with XLA, fusing its operations into fewer
+            kernels during training, evaluation, and making predictions.
+
+        Raises
+        ------
+        ModelError
+            If there is an issue compiling the model.
+        """
+        super().compile(jit_compile)
+
+        self._predict_function = None
+
     def upload(self, buff: io.BytesIO) -> None:
         """
         Upload a model from the provided file.
 
+        The file is identified by the SHA-1 digest of its content, so uploading the
+        same file again keeps the already loaded model and its configuration.
+
         Parameters
         ----------
         buff : file-like object
@@ -574,21 +776,35 @@ class UploadedModel(Model):
         Raises
         ------
         UploadError
-            If there is an issue reading the model from the file. If there is an issue
-            validating the shapes of the model.
+            If the file is not in the H5 format. If there is an issue reading the model
+            from the file. If there is an issue validating the shapes of the model.
         """
+        with buff.getbuffer() as view:
+            digest = hashlib.sha1(view).hexdigest()
+
+        if digest == self._digest:
+            return
+
         try:
-            with tempfile.NamedTemporaryFile() as tmp:
+            tools.model.validate_format(buff)
+
+            with tempfile.NamedTemporaryFile(suffix=".h5") as tmp:
                 tmp.write(buff.getbuffer())
+                tmp.flush()
 
-                model = typing.cast(
-                    t.Object, tf.keras.models.load_model(tmp.name, compile=False)
-                )
+                with self._strategy.scope():
+                    model = typing.cast(
+                        t.Object, tf.keras.models.load_model(tmp.name, compile=False)
+                    )
                 tools.model.validate_shapes(model.input_shape)
                 tools.model.validate_shapes(model.output_shape)
 
                 self._object = model
                 self._built = True
+                self._digest = digest
+                # A different model is uploaded, so none of the choices apply to it
+                self._losses = dict()
+                self._metrics = dict()
                 self._set_config()
                 self.update_state()
         except (ValueError, errors.ValidateModelError) as error:
@@ -603,7 +819,7 @@ class UploadedModel(Model):
         data : DataFrame
             Input and output data.
         batch_size : int
-            Batch size.
+            Batch size per device.
 
         Raises
         ------
@@ -620,27 +836,63 @@ class UploadedModel(Model):
                 "The data for evaluation contains non-numeric values!"
             )
 
+        # The global batch is split among the replicas, so scale it per replica
+        global_batch_size = batch_size * self._strategy.num_replicas_in_sync
+
         try:
+            dataset = tf.data.Dataset.from_tensor_slices(
+                (
+                    self._get_processed_data(data, "input"),
+                    self._get_processed_data(data, "output"),
+                )
+            )
             logs = typing.cast(
                 dict[str, float],
                 self._object.evaluate(
-                    x=self._get_processed_data(data, "input"),
-                    y=self._get_processed_data(data, "output"),
-                    batch_size=batch_size,
+                    x=self._get_batched_dataset(dataset, global_batch_size),
                     callbacks=self._callbacks.values(),
                     return_dict=True,
                 ),
             )  # Type-cast the return value as 'return_dict' is set to True
             results = pd.DataFrame(logs.items(), columns=["Name", "Value"])
-        except (RuntimeError, ValueError, AttributeError, TypeError):
+        except (RuntimeError, ValueError, AttributeError, TypeError, tf.errors.OpError):
             raise errors.ModelError("Unable to evaluate the model!")
 
         return results
 
+    def _get_predict_function(self, jit_compile: bool) -> t.PredictFunction:
+        """
+        Get the function for making predictions with the model.
+
+        Parameters
+        ----------
+        jit_compile : bool
+            Whether to compile the function with XLA.
+
+        Returns
+        -------
+        ConcreteFunction
+            Function mapping a batch of inputs to the model's outputs.
+        """
+        signature = {
+            layer: tf.TensorSpec((None, shape), tf.float32)
+            for layer, shape in self._input_shape.items()
+        }
+        function = tf.function(
+            lambda x: self._object(x, training=False), jit_compile=jit_compile
+        )
+
+        return function.get_concrete_function(signature)
+
     def predict(self, data: t.DataFrame, batch_size: int) -> t.Predictions:
         """
         Make predictions using the model on the provided data.
 
+        The function for making predictions is traced once and reused until the model
+        is changed or compiled again. It is compiled with XLA unless the model is
+        compiled without it, falling back to running without XLA if the model has
+        operations that XLA doesn't support.
+
         Parameters
         ----------
         data : DataFrame
@@ -664,10 +916,33 @@ class UploadedModel(Model):
             )
 
         try:
-            arrays = self._object.predict(
-                x=self._get_processed_data(data, "input"),
-                batch_size=batch_size,
-                callbacks=self._callbacks.values(),
+            dataset = tf.data.Dataset.from_tensor_slices(
+                self._get_processed_data(data, "input")
+            )
+            batched_dataset = self._get_batched_dataset(dataset, batch_size)
+
+            if self._predict_function is None:
+                # The flag is None until the model is compiled, so XLA is the default
+                jit_compile = self._object.jit_compile is not False
+                self._predict_function = (
+                    jit_compile,
+                    self._get_predict_function(jit_compile),
+                )
+
+            jit_compile, function = self._predict_function
+
+            try:
+                batches = [function(batch) for batch in batched_dataset]
+            except tf.errors.OpError:
+                if not jit_compile:
+                    raise
+
+                # Some operations, e.g. lookup tables, can't be compiled with XLA
+                function = self._get_predict_function(False)
+                self._predict_function = (False, function)
+                batches = [function(batch) for batch in batched_dataset]
+            arrays = tf.nest.map_structure(
+                lambda *tensors: tf.concat(tensors, axis=0).numpy(), *batches
             )
 
             if isinstance(arrays, dict):
@@ -676,7 +951,7 @@ class UploadedModel(Model):
                 predictions = [pd.DataFrame(array) for array in arrays]
             else:
                 predictions = [pd.DataFrame(arrays)]
-        except (RuntimeError, ValueError, AttributeError, TypeError):
+        except (RuntimeError, ValueError, AttributeError, TypeError, tf.errors.OpError):
             raise errors.ModelError("Unable to make the prediction!")
 
         return predictions
@@ -685,15 +960,18 @@ class UploadedModel(Model):
 class CreatedModel(Model):
     """Class representing the created model."""
 
+    __slots__ = ("_layers", "_modified")
+
     def __init__(self) -> None:
         """Initialize an empty created machine learning model."""
-        self.reset_state()
+        super().__init__()
 
     def reset_state(self) -> None:
         """Reset the state of the created model."""
         super().reset_state()
 
         self._layers: t.LayerObject = dict()
+        self._modified: bool = False
 
     def set_name(self, name: str) -> None:
         """
@@ -705,6 +983,7 @@ class CreatedModel(Model):
             Name of the model.
         """
         self._name = name
+        self._modified = True
 
     def set_layer(
         self,
@@ -738,10 +1017,11 @@ class CreatedModel(Model):
         try:
             prototype = enums.layers.classes[entity]
 
-            if connection is None:
-                layer = prototype(name=name, **params)
-            else:
-                layer = prototype(name=name, **params)(connection)
+            with self._strategy.scope():
+                if connection is None:
+                    layer = prototype(name=name, **params)
+                else:
+                    layer = prototype(name=name, **params)(connection)
         except KeyError:
             raise errors.SetError("There is no prototype for this layer!")
         except (ValueError, AttributeError, TypeError):
@@ -751,6 +1031,7 @@ class CreatedModel(Model):
             self._inputs.append(name)
 
         self._layers[name] = layer
+        self._modified = True
 
     def delete_last_layer(self) -> None:
         """
@@ -776,6 +1057,8 @@ class CreatedModel(Model):
         except ValueError:
             pass
 
+        self._modified = True
+
     def set_outputs(self, outputs: t.Layers) -> None:
         """
         Set the output layers for the created model.
@@ -794,16 +1077,24 @@ class CreatedModel(Model):
             raise errors.SetError("Please, select at least one output!")
 
         self._outputs = outputs
+        self._modified = True
 
     def create(self) -> None:
         """
         Create the machine learning model.
 
+        The layers are only staged until this method is called, so the model is built
+        once for all the changes made. If nothing has changed since the last call, the
+        already built model is kept as is.
+
         Raises
         ------
         CreateError
             If there is an issue creating the model.
         """
+        if self._built and not self._modified:
+            return
+
         input_layers = {name: self._layers[name] for name in self._inputs}
         output_layers = {name: self._layers[name] for name in self._outputs}
 
@@ -811,13 +1102,15 @@ class CreatedModel(Model):
             raise errors.CreateError("There are no input or output layers!")
 
         try:
-            self._object = tf.keras.Model(
-                inputs=input_layers, outputs=output_layers, name=self._name
-            )
+            with self._strategy.scope():
+                self._object = tf.keras.Model(
+                    inputs=input_layers, outputs=output_layers, name=self._name
+                )
         except (ValueError, AttributeError, TypeError):
             raise errors.CreateError("Unable to create the model!")
 
         self._built = True
+        self._modified = False
         self._set_config()
         self.update_state()
 
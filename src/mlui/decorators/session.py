@@ -24,16 +24,16 @@ def set_state(func: t.FuncType) -> t.FuncType:
 
     @functools.wraps(func)
     def wrapper() -> None:
-        if not st.session_state.get("task"):
+        if "task" not in st.session_state:
             st.session_state.task = "Train"
 
-        if not st.session_state.get("data"):
+        if "data" not in st.session_state:
             st.session_state.data = data.Data()
 
-        if not st.session_state.get("model"):
+        if "model" not in st.session_state:
             st.session_state.model = model.CreatedModel()
 
-        if not st.session_state.get("model_type"):
+        if "model_type" not in st.session_state:
             st.session_state.model_type = "Created"
 
         func()
@@ -1,4 +1,5 @@
 import csv
+import io
 
 import pandas as pd
 
@@ -6,6 +7,36 @@ import mlui.classes.errors as errors
 import mlui.types.classes as t
 
 
+def read_sample(buff: io.BytesIO, size: int = 65_536) -> str:
+    """
+    Read a sample of complete lines from the beginning of a byte buffer.
+
+    Only the sample is copied and decoded, which is enough to parse the structure of
+    a CSV file without duplicating the whole buffer.
+
+    Parameters
+    ----------
+    buff : file-like object
+        Byte buffer to read the sample from.
+    size : int, default 65536
+        Maximum size of the sample in bytes.
+
+    Returns
+    -------
+    str
+        Decoded sample. If the buffer is larger than the sample, its incomplete last
+        line is dropped.
+    """
+    with buff.getbuffer() as view:
+        sample = view[:size].tobytes().decode("utf-8", errors="ignore")
+        truncated = len(view) > size
+
+    if truncated:
+        sample = sample[: sample.rfind("\n") + 1] or sample
+
+    return sample
+
+
 def parse_csv(csv_str: str) -> str:
     """
     Parse the delimiter of a CSV string and check for a header.
@@ -1,6 +1,37 @@
+import hashlib
+import io
+import json
+
 import mlui.types.classes as t
 from mlui.classes import errors
 
+_HDF5_SIGNATURE = b"\x89HDF\r\n\x1a\n"
+
+
+def validate_format(buff: io.BytesIO) -> None:
+    """
+    Validate the format of a model file.
+
+    Only H5 files are accepted, as Keras loads them much faster than the SavedModel
+    format, which has to reconstruct the model from its traced functions. The format
+    is recognized by the HDF5 signature at the start of the file.
+
+    Parameters
+    ----------
+    buff : file-like object
+        Byte buffer containing the model.
+
+    Raises
+    ------
+    ValidateModelError
+        If the file is not in the H5 format.
+    """
+    with buff.getbuffer() as view:
+        signature = bytes(view[: len(_HDF5_SIGNATURE)])
+
+    if signature != _HDF5_SIGNATURE:
+        raise errors.ValidateModelError("The model's file is not in the H5 format!")
+
 
 def validate_shapes(shapes: t.Shapes) -> None:
     """
@@ -21,12 +52,14 @@ def validate_shapes(shapes: t.Shapes) -> None:
         raise errors.ValidateModelError("The model's shapes are empty!")
 
     if isinstance(shapes, dict):
-        shapes = list(shapes.values())
+        shapes_list = list(shapes.values())
     elif isinstance(shapes, tuple):
-        shapes = [shapes]
+        shapes_list = [shapes]
+    else:
+        shapes_list = shapes
 
-    for shape in shapes:
-        if not shapes:
+    for shape in shapes_list:
+        if not shape:
             raise errors.ValidateModelError(
                 "At least one of the model's shapes is empty!"
             )
@@ -35,3 +68,25 @@ def validate_shapes(shapes: t.Shapes) -> None:
             raise errors.ValidateModelError(
                 "At least one of the model's shapes contains more than 2 dimensions!"
             )
+
+
+def get_config_hash(model: t.Object) -> str:
+    """
+    Get the hash of a model's configuration.
+
+    The configuration describes the model's architecture, so models with the same
+    topology and layers' parameters have the same hash.
+
+    Parameters
+    ----------
+    model : Model
+        Model to be hashed.
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-1 digest of the configuration.
+    """
+    config = json.dumps(model.get_config(), sort_keys=True, default=str)
+
+    return hashlib.sha1(config.encode()).hexdigest()
@@ -17,12 +17,16 @@ Features: typing.TypeAlias = list[str]
 DataFrame: typing.TypeAlias = pd.DataFrame
 
 Object: typing.TypeAlias = tf.keras.Model
+Strategy: typing.TypeAlias = tf.distribute.Strategy
 Side: typing.TypeAlias = typing.Literal["input", "output"]
 Shape: typing.TypeAlias = tuple[None, int]
 Shapes: typing.TypeAlias = dict[str, Shape] | list[Shape] | Shape
-NDArray: typing.TypeAlias = npt.NDArray[np.float64]
+NDArray: typing.TypeAlias = npt.NDArray[np.float32]
+Dataset: typing.TypeAlias = tf.data.Dataset
 EvaluationResults: typing.TypeAlias = DataFrame
 Predictions: typing.TypeAlias = list[DataFrame]
+PredictFunction: typing.TypeAlias = tf.types.experimental.ConcreteFunction
+Quantization: typing.TypeAlias = typing.Literal["float16", "int8"]
 
 # Charts
 LogsNames: typing.TypeAlias = list[str]
@@ -31,7 +35,7 @@ Chart: typing.TypeAlias = alt.Chart
 # Activations
 Tensor: typing.TypeAlias = tf.Tensor
 ActivationType: typing.TypeAlias = typing.Type[typing.Callable[..., tf.Tensor]]
-ActivationTypes: typing.TypeAlias = dict[str, ActivationType]
+ActivationTypes: typing.TypeAlias = typing.Mapping[str, ActivationType]
 
 # Layers
 Layer: typing.TypeAlias = tf.keras.layers.Layer
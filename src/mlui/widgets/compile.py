@@ -114,13 +114,16 @@ def compile_model_ui(model: model.Model) -> None:
     st.markdown(
         "Compile the model by pressing the provided button. It will use the parameters "
         "selected above. Any changes made to the previous sections afterward will not "
-        "take effect until you click the button again."
+        "take effect until you click the button again. XLA compilation usually speeds "
+        "up the model's computations, but it may take extra time for the first call."
     )
 
+    jit_compile = st.toggle("XLA Compilation", value=True)
+
     def compile_model() -> None:
         """Supporting function for the accurate representation of widgets."""
         try:
-            model.compile()
+            model.compile(jit_compile)
             st.toast("Model is compiled!", icon="✅")
         except errors.ModelError as error:
             st.toast(error, icon="❌")
@@ -37,11 +37,9 @@ def set_features_ui(data: data.Data, model: model.Model) -> None:
     if side == "Input":
         at = "input"
         layers = model.inputs
-        shapes = model.input_shape
     else:
         at = "output"
         layers = model.outputs
-        shapes = model.output_shape
 
     layer = str(st.selectbox("Select layer:", layers))
     available = data.get_unused_columns()
@@ -51,7 +49,7 @@ def set_features_ui(data: data.Data, model: model.Model) -> None:
         "Select columns (order is important):",
         available,
         default,
-        max_selections=shapes[layer],
+        max_selections=model.get_shape(layer, at),
     )
 
     def set_features() -> None:
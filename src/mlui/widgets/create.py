@@ -46,22 +46,20 @@ def set_layers_ui(model: model.CreatedModel) -> None:
         "Add layers to the model, specifying their class, name (default value if "
         "nothing is provided), and additional parameters. Always start with `Input` "
         "layer(s). If needed, you can delete the last added layer in case of a mistake "
-        "or if you want to make changes."
+        "or if you want to make changes. The name and parameters are submitted "
+        "together once you click the `Set Layer` button, so adjusting them doesn't "
+        "reload the page."
     )
 
     layers = enums.layers.classes
     objects = model.layers
     default = f"layer_{len(objects) + 1}"
     entity = str(st.selectbox("Select layer's class:", layers))
-    name = st.text_input("Enter layer's name:", max_chars=50, placeholder=default)
-
-    with st.expander("Layer's Parameters"):
-        prototype = enums.layers.widgets[entity]
-        widget = prototype(objects)
 
     def set_layer() -> None:
         """Supporting function for the accurate representation of widgets."""
         try:
+            name = st.session_state.layer_name
             params = widget.params
             connection = widget.get_connection()
 
@@ -78,7 +76,18 @@ def set_layers_ui(model: model.CreatedModel) -> None:
         except errors.DeleteError as error:
             st.toast(error, icon="❌")
 
-    st.button("Set Layer", on_click=set_layer)
+    with st.form("set_layer_form", border=False):
+        st.text_input(
+            "Enter layer's name:", max_chars=50, placeholder=default, key="layer_name"
+        )
+
+        with st.expander("Layer's Parameters"):
+            prototype = enums.layers.widgets[entity]
+            widget = prototype(objects)
+            widget.render()
+
+        st.form_submit_button("Set Layer", on_click=set_layer)
+
     st.button("Delete Last Layer", on_click=delete_last_layer)
 
 
@@ -91,9 +91,11 @@ def plot_columns_ui(data: data.Data) -> None:
         "the upper right corner."
     )
 
+    columns = tuple(data.columns)
+
     with st.form("plot_columns_form", border=False):
-        x = st.selectbox("Select X-axis column:", data.columns)
-        y = st.selectbox("Select Y-axis column:", data.columns)
+        x = st.selectbox("Select X-axis column:", columns)
+        y = st.selectbox("Select Y-axis column:", columns)
         points = st.toggle("Point Markers")
         plot_columns_btn = st.form_submit_button("Plot Columns")
 
@@ -21,7 +21,7 @@ def evaluate_model_ui(data: data.Data, model: model.UploadedModel) -> None:
         "button is clicked, the evaluation results will be displayed in the respective "
         "dropdown. Depending on the size of your model and chosen batch size, it might "
         "take some time. The results are values of specified metrics and loss "
-        "functions."
+        "functions. The batch size is set per device, as in training."
     )
 
     batch_size = st.number_input(
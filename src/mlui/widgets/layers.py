@@ -1,4 +1,5 @@
 import abc
+import operator
 
 import streamlit as st
 
@@ -6,13 +7,20 @@ import mlui.classes.errors as errors
 import mlui.enums as enums
 import mlui.types.classes as t
 
+_LINEAR_ACTIVATION = enums.activations.classes["Linear"]
+# Only the most recently added layers are offered for connection, so the option lists
+# stay responsive for large models
+_LAYER_OPTIONS_CAP = 500
+
 
 class LayerWidget(abc.ABC):
     """Base class for a widget of the layer."""
 
+    __slots__ = ("_layers", "_options")
+
     def __init__(self, layers: t.LayerObject) -> None:
         """
-        Initialize the widgets of parameters.
+        Initialize the widget.
 
         Parameters
         ----------
@@ -20,6 +28,16 @@ class LayerWidget(abc.ABC):
             Layers of the model.
         """
         self._layers = layers
+        self._options = tuple(layers)[-_LAYER_OPTIONS_CAP:]
+
+    @abc.abstractmethod
+    def render(self) -> None:
+        """
+        Generate the widgets of parameters.
+
+        Each widget has a stable key, and its current value is read from the session
+        state under that key, so callbacks always get the latest value.
+        """
 
     @abc.abstractmethod
     def get_connection(self) -> t.LayerConnection:
@@ -43,14 +61,44 @@ class LayerWidget(abc.ABC):
         """Adjustable parameters of the layer."""
 
 
+class _SingleConnectLayerWidget(LayerWidget):
+    """Base class for a widget of the layer connected to a single layer."""
+
+    __slots__ = ()
+
+    def render(self) -> None:
+        """
+        Generate the connection widget.
+
+        Subclasses render their own widgets and then call this method.
+        """
+        st.selectbox("Connect layer to:", self._options, key="connect_to")
+
+    def get_connection(self) -> t.Layer:
+        layer = self._layers.get(st.session_state.connect_to)
+
+        if layer is None:
+            raise errors.LayerError("Please, select the connection!")
+
+        return layer
+
+
 class Input(LayerWidget):
     """Widget class for the Input layer."""
 
-    def __init__(self, layers: t.LayerObject) -> None:
-        super().__init__(layers)
+    __slots__ = ()
+
+    def render(self) -> None:
+        data = st.session_state.data
+        # The layer can't take more columns than the uploaded data has
+        max_columns = 10_000 if data.empty else len(data.columns)
 
-        self._input_shape = st.number_input(
-            "Number of input columns:", value=1, min_value=1, max_value=10_000
+        st.number_input(
+            "Number of input columns:",
+            value=1,
+            min_value=1,
+            max_value=max_columns,
+            key="input_shape",
         )
 
     def get_connection(self) -> None:
@@ -58,104 +106,109 @@ class Input(LayerWidget):
 
     @property
     def params(self) -> t.InputParams:
-        return {"shape": (int(self._input_shape),)}
+        return {"shape": (st.session_state.input_shape,)}
 
 
-class Dense(LayerWidget):
+class Dense(_SingleConnectLayerWidget):
     """Widget class for the Dense layer."""
 
-    def __init__(self, layers: t.LayerObject) -> None:
-        super().__init__(layers)
+    __slots__ = ()
 
-        activations = enums.activations.classes
-        self._units_num = st.number_input(
-            "Number of units:", value=1, min_value=1, max_value=10_000
+    def render(self) -> None:
+        st.number_input(
+            "Number of units:",
+            value=1,
+            min_value=1,
+            max_value=10_000,
+            key="dense_units",
         )
-        self._activation = st.selectbox("Activation function:", activations)
-        self._connect_to = st.selectbox("Connect layer to:", self._layers)
-
-    def get_connection(self) -> t.Layer:
-        if not self._connect_to:
-            raise errors.LayerError("Please, select the connection!")
-
-        return self._layers[self._connect_to]
+        st.selectbox(
+            "Activation function:", enums.activations.names, key="dense_activation"
+        )
+        super().render()
 
     @property
     def params(self) -> t.DenseParams:
         return {
-            "units": int(self._units_num),
-            "activation": enums.activations.classes[self._activation]
-            if self._activation
-            else enums.activations.classes["Linear"],
+            "units": st.session_state.dense_units,
+            "activation": enums.activations.classes.get(
+                st.session_state.dense_activation, _LINEAR_ACTIVATION
+            ),
         }
 
 
 class Concatenate(LayerWidget):
     """Widget class for the Concatenate layer."""
 
-    def __init__(self, layers: t.LayerObject) -> None:
-        super().__init__(layers)
+    __slots__ = ()
 
-        self._concatenate = st.multiselect("Select layers (at least 2):", self._layers)
+    def render(self) -> None:
+        st.multiselect(
+            "Select layers (at least 2):", self._options, key="concatenate_layers"
+        )
 
     def get_connection(self) -> list[t.Layer]:
-        if len(self._concatenate) < 2:
+        concatenate = st.session_state.concatenate_layers
+
+        if len(concatenate) < 2:
             raise errors.LayerError("Please, select the layers to concatenate!")
 
-        return [self._layers[name] for name in self._concatenate]
+        return list(operator.itemgetter(*concatenate)(self._layers))
 
     @property
     def params(self) -> t.LayerParams:
         return {}
 
 
-class BatchNormalization(LayerWidget):
+class BatchNormalization(_SingleConnectLayerWidget):
     """Widget class for the BatchNormalization layer."""
 
-    def __init__(self, layers: t.LayerObject) -> None:
-        super().__init__(layers)
+    __slots__ = ()
 
-        self._momentum = st.number_input(
-            "Momentum:", value=0.99, min_value=1e-2, max_value=1.0, step=1e-2
+    def render(self) -> None:
+        st.number_input(
+            "Momentum:",
+            value=0.99,
+            min_value=1e-2,
+            max_value=1.0,
+            step=1e-2,
+            key="batch_normalization_momentum",
         )
-        self._epsilon = st.number_input(
+        st.number_input(
             "Epsilon",
             value=1e-3,
             min_value=1e-4,
             max_value=1e-2,
             step=1e-4,
             format="%e",
+            key="batch_normalization_epsilon",
         )
-        self._connect_to = st.selectbox("Connect layer to:", self._layers)
-
-    def get_connection(self) -> t.Layer:
-        if not self._connect_to:
-            raise errors.LayerError("Please, select the connection!")
-
-        return self._layers[self._connect_to]
+        super().render()
 
     @property
     def params(self) -> t.BatchNormalizationParams:
-        return {"momentum": float(self._momentum), "epsilon": float(self._epsilon)}
+        return {
+            "momentum": st.session_state.batch_normalization_momentum,
+            "epsilon": st.session_state.batch_normalization_epsilon,
+        }
 
 
-class Dropout(LayerWidget):
+class Dropout(_SingleConnectLayerWidget):
     """Widget class for the Dropout layer."""
 
-    def __init__(self, layers: t.LayerObject) -> None:
-        super().__init__(layers)
+    __slots__ = ()
 
-        self._rate = st.number_input(
-            "Rate:", value=0.2, min_value=1e-2, max_value=0.99, step=1e-2
+    def render(self) -> None:
+        st.number_input(
+            "Rate:",
+            value=0.2,
+            min_value=1e-2,
+            max_value=0.99,
+            step=1e-2,
+            key="dropout_rate",
         )
-        self._connect_to = st.selectbox("Connect layer to:", self._layers)
-
-    def get_connection(self) -> t.Layer:
-        if not self._connect_to:
-            raise errors.LayerError("Please, select the connection!")
-
-        return self._layers[self._connect_to]
+        super().render()
 
     @property
     def params(self) -> t.DropoutParams:
-        return {"rate": float(self._rate)}
+        return {"rate": st.session_state.dropout_rate}
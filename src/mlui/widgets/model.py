@@ -2,7 +2,9 @@ import streamlit as st
 import streamlit_extras.capture as capture
 
 import mlui.classes.data as data
+import mlui.classes.errors as errors
 import mlui.classes.model as model
+import mlui.types.classes as t
 
 
 def model_info_ui(model: model.Model) -> None:
@@ -86,12 +88,38 @@ def download_model_ui(model: model.Model) -> None:
         Model object.
     """
     st.header("Download Model")
-    st.markdown("Download the model in `H5` format.")
+    st.markdown(
+        "Download the model in `H5` format. If you only need the updated weights of a "
+        "model whose architecture you already have, download them alone, which is "
+        "faster. Be aware that such a file cannot be uploaded back to the app. For "
+        "inference-only use, you may instead download the model in `TFLite` format "
+        "with its weights quantized to `float16` or `int8`, which makes it smaller and "
+        "faster."
+    )
 
+    formats = ("H5", "H5 (weights only)", "TFLite (float16)", "TFLite (int8)")
+    entity = st.selectbox("Select format:", formats)
     name = model.name
-    model_as_bytes = model.as_bytes
 
-    st.download_button("Download Model", model_as_bytes, f"{name}.h5")
+    if entity == "H5":
+        model_as_bytes = model.as_bytes
+
+        st.download_button("Download Model", model_as_bytes, f"{name}.h5")
+        return
+
+    if entity == "H5 (weights only)":
+        weights_as_bytes = model.weights_as_bytes
+
+        st.download_button("Download Model", weights_as_bytes, f"{name}.weights.h5")
+        return
+
+    try:
+        quantization: t.Quantization = "float16" if "float16" in entity else "int8"
+        model_as_bytes = model.get_quantized_bytes(quantization)
+
+        st.download_button("Download Model", model_as_bytes, f"{name}.tflite")
+    except errors.ModelError as error:
+        st.toast(error, icon="❌")
 
 
 def reset_model_ui(data: data.Data, model: model.Model) -> None:
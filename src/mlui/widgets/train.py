@@ -25,7 +25,8 @@ def fit_model_ui(data: data.Data, model: model.Model) -> None:
         "chosen hyperparameters, it might take some time. Be aware that if you change "
         "a widget's value or navigate to other pages, the logs dropdown will "
         "disappear. However, you will still be able to examine the history dataframe "
-        "and plot the logs in the next section."
+        "and plot the logs in the next section. The batch size is set per device, so "
+        "with several GPUs each step processes that many samples on each of them."
     )
 
     batch_size = st.number_input(